@@ -1,27 +1,112 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import desc, select
+from fastapi import APIRouter, HTTPException, Request, Response
+from sqlalchemy import desc, func, select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.config import settings
+from app.database import SessionScoped
 from app.models import Document
-from app.queries import get_document_or_404, get_latest_extraction
-from app.schemas import DocumentDetail, DocumentListItem
+from app.processors.pipeline import load_snapshot
+from app.queries import (
+    LATEST_EXTRACTION,
+    LATEST_EXTRACTION_ON,
+    get_document_or_404,
+    get_document_with_latest_extraction,
+)
+from app.responses import OrjsonResponse, etag_for
+from app.schemas import _status_str, document_detail
 
 router = APIRouter(prefix="/api/documents", tags=["documents"])
 
+CACHE_CONTROL = "private, must-revalidate, max-age=0"
 
-@router.get("", response_model=list[DocumentListItem])
-def list_documents(db: Session = Depends(get_db)) -> list[DocumentListItem]:
-    documents = db.scalars(select(Document).order_by(desc(Document.created_at))).all()
-    return [DocumentListItem.model_validate(doc) for doc in documents]
+OCR_DIR = settings.ocr_dir
 
+# Statements built once at import; handlers only bind parameters per request.
+_DOCUMENTS_ETAG_STMT = select(func.count(Document.id), func.max(Document.updated_at))
 
-@router.get("/{document_id}", response_model=DocumentDetail)
-def get_document(document_id: str, db: Session = Depends(get_db)) -> DocumentDetail:
-    document = get_document_or_404(db, document_id)
-    extraction = get_latest_extraction(db, document_id)
-    payload = DocumentDetail.model_validate(document)
-    payload.extraction = extraction.extraction_data if extraction else None
-    return payload
+# Column-only selects: listings never need file_path/error_message, and rows
+# come back as plain tuples with a ready-made ._mapping dict — no ORM
+# instances, no identity-map bookkeeping, no per-field getattr.
+_LIST_COLUMNS = (
+    Document.id,
+    Document.original_filename,
+    Document.status,
+    Document.document_type,
+    Document.confidence_score,
+    Document.content_type,
+    Document.created_at,
+)
+
+_LIST_DOCUMENTS_STMT = select(*_LIST_COLUMNS).order_by(desc(Document.created_at))
+
+# ?include=extraction hydrates each row's latest extraction in the same
+# statement, so clients rendering details don't fan out into per-document
+# GETs (N+1 over HTTP).
+_LIST_WITH_EXTRACTION_STMT = (
+    select(*_LIST_COLUMNS, LATEST_EXTRACTION.extraction_data.label("extraction"))
+    .outerjoin(LATEST_EXTRACTION, LATEST_EXTRACTION_ON)
+    .order_by(desc(Document.created_at))
+)
+
+
+def _documents_etag(db: Session) -> str:
+    count, latest = db.execute(_DOCUMENTS_ETAG_STMT).one()
+    return etag_for(count, latest)
+
+
+# response_model=None: the DTOs are plain TypedDicts serialized as-is, with
+# no outbound validation pass per row.
+# Read-only handlers use the thread-local SessionScoped registry directly:
+# acquisition is a dict lookup, with no Depends overhead per request.
+# Handlers return OrjsonResponse directly: the payload dicts go straight to
+# orjson without the jsonable_encoder walk FastAPI otherwise runs on return
+# values (orjson serializes datetimes and str-enums natively).
+@router.get("", response_model=None)
+def list_documents(request: Request, include: str | None = None) -> Response:
+    db = SessionScoped()
+    try:
+        etag = _documents_etag(db)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        stmt = _LIST_WITH_EXTRACTION_STMT if include == "extraction" else _LIST_DOCUMENTS_STMT
+        items = [
+            dict(row._mapping) | {"status": _status_str(row.status)} for row in db.execute(stmt)
+        ]
+        return OrjsonResponse(items, headers=headers)
+    finally:
+        SessionScoped.remove()
+
+
+@router.get("/{document_id}", response_model=None)
+def get_document(document_id: str, request: Request) -> Response:
+    db = SessionScoped()
+    try:
+        document, extraction = get_document_with_latest_extraction(db, document_id)
+
+        etag = etag_for(document.id, document.updated_at)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+
+        return OrjsonResponse(
+            document_detail(document, extraction),
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+        )
+    finally:
+        SessionScoped.remove()
+
+
+@router.get("/{document_id}/ocr")
+def get_document_ocr(document_id: str) -> dict:
+    db = SessionScoped()
+    try:
+        get_document_or_404(db, document_id)
+    finally:
+        SessionScoped.remove()
+    snapshot = load_snapshot(OCR_DIR, document_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="OCR snapshot not found")
+    return snapshot
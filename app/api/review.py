@@ -1,40 +1,69 @@
 from __future__ import annotations
 
-import json
-
-from fastapi import APIRouter, Depends, Form
-from sqlalchemy import desc, select
+import orjson
+from fastapi import APIRouter, Depends, Form, HTTPException
+from sqlalchemy import desc, select, update
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models import Document, DocumentStatus, ReviewState
-from app.queries import get_document_or_404, get_latest_extraction_or_404
-from app.schemas import ReviewQueueItem, ReviewUpdateRequest
+from app.database import SessionScoped, get_db
+from app.models import Document, DocumentStatus, Extraction, ReviewState
+from app.queries import LATEST_EXTRACTION, LATEST_EXTRACTION_ON, get_document_with_latest_extraction
+from app.responses import OrjsonResponse
+from app.schemas import ReviewUpdateRequest, review_queue_item
 
 router = APIRouter(prefix="/api/review", tags=["review"])
 
+# The whole queue (documents + their latest extraction) is served by one
+# query instead of one extra query per item. Built once at import.
+_REVIEW_QUEUE_STMT = (
+    select(Document, LATEST_EXTRACTION)
+    .outerjoin(LATEST_EXTRACTION, LATEST_EXTRACTION_ON)
+    .where(Document.status == DocumentStatus.review_required)
+    .order_by(desc(Document.created_at))
+)
+
 
-@router.get("/queue", response_model=list[ReviewQueueItem])
-def review_queue(db: Session = Depends(get_db)) -> list[ReviewQueueItem]:
-    items = db.scalars(
-        select(Document).where(Document.status == DocumentStatus.review_required).order_by(desc(Document.created_at))
-    ).all()
-    return [ReviewQueueItem.from_document(item) for item in items]
+# Read-only: uses the thread-local SessionScoped registry instead of a
+# Depends-managed session (see app.database).
+@router.get("/queue", response_model=None)
+def review_queue() -> OrjsonResponse:
+    db = SessionScoped()
+    try:
+        rows = db.execute(_REVIEW_QUEUE_STMT).all()
+        # Direct OrjsonResponse skips the jsonable_encoder walk over every
+        # embedded extraction payload.
+        return OrjsonResponse([review_queue_item(document, extraction) for document, extraction in rows])
+    finally:
+        SessionScoped.remove()
 
 
 def _update_review_status(
     db: Session, document_id: str, doc_status: DocumentStatus, review_state: ReviewState, extraction_json: str = "",
 ) -> dict[str, str]:
-    document = get_document_or_404(db, document_id)
-    extraction = get_latest_extraction_or_404(db, document_id)
+    document, extraction = get_document_with_latest_extraction(db, document_id)
+    if extraction is None:
+        raise HTTPException(status_code=404, detail="Extraction not found")
 
+    extraction_values: dict[str, object] = {"review_state": review_state}
     if extraction_json.strip():
-        payload = ReviewUpdateRequest(extraction_data=json.loads(extraction_json))
-        extraction.extraction_data = payload.extraction_data or extraction.extraction_data
+        payload = ReviewUpdateRequest(extraction_data=orjson.loads(extraction_json))
+        if payload.extraction_data:
+            extraction_values["extraction_data"] = payload.extraction_data
 
-    extraction.review_state = review_state
-    document.status = doc_status
-    db.add_all([document, extraction])
+    # Core UPDATEs skip the unit-of-work bookkeeping; the instances aren't
+    # read again after commit, so session synchronization is unnecessary.
+    db.execute(
+        update(Extraction)
+        .where(Extraction.id == extraction.id)
+        .values(**extraction_values)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(Document)
+        .where(Document.id == document_id)
+        .values(status=doc_status)
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
     return {"status": review_state.value, "document_id": document_id}
 
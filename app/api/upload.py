@@ -3,36 +3,82 @@ from __future__ import annotations
 from pathlib import Path
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, Response, UploadFile
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import get_db
-from app.models import Document
+from app.database import SessionLocal, SessionScoped, get_db
+from app.models import Document, DocumentStatus
 from app.processors.pipeline import process_document
-from app.queries import get_document_or_404
-from app.schemas import UploadResponse
+from app.responses import OrjsonResponse, etag_for
+from app.schemas import UploadResponse, upload_response
 
 router = APIRouter(prefix="/api/upload", tags=["upload"])
 
 ALLOWED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg"}
 
+COPY_BUFFER_SIZE = 1024 * 1024
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+# Bound once at import; the lifespan hook creates the directory at startup.
+UPLOAD_DIR = Path(settings.upload_dir)
+
+# Status polling only needs these columns; skip full ORM instance loading.
+_STATUS_STMT = select(
+    Document.id,
+    Document.status,
+    Document.document_type,
+    Document.confidence_score,
+    Document.updated_at,
+).where(Document.id == bindparam("document_id"))
+
 
 def _save_upload(file: UploadFile) -> str:
     ext = Path(file.filename or "").suffix.lower()
     if ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Unsupported file type")
 
-    target_dir = Path(settings.upload_dir)
-    target_dir.mkdir(parents=True, exist_ok=True)
-    target_path = target_dir / f"{uuid4()}{ext}"
-    with target_path.open("wb") as out_file:
-        out_file.write(file.file.read())
+    # Declared size (from Content-Length) lets oversize uploads be rejected
+    # before a single byte is copied.
+    if file.size and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Upload too large")
+
+    target_path = UPLOAD_DIR / f"{uuid4()}{ext}"
+    # Stream in 1 MiB chunks instead of slurping the whole upload into one
+    # bytes object — keeps memory flat for large PDFs. The byte count is
+    # enforced during the copy too, since the declared size can lie.
+    written = 0
+    try:
+        with target_path.open("wb") as out_file:
+            while chunk := file.file.read(COPY_BUFFER_SIZE):
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+                out_file.write(chunk)
+    except HTTPException:
+        target_path.unlink(missing_ok=True)
+        raise
     return str(target_path)
 
 
-@router.post("", response_model=UploadResponse)
-def upload_document(file: UploadFile = File(...), db: Session = Depends(get_db)) -> UploadResponse:
+def _run_pipeline(document_id: str) -> None:
+    # Runs after the response is sent; the request session is closed by then,
+    # so the task opens its own.
+    db = SessionLocal()
+    try:
+        document = db.get(Document, document_id)
+        if document is not None:
+            process_document(db, document)
+    finally:
+        db.close()
+
+
+@router.post("", response_model=None, status_code=202)
+def upload_document(
+    background_tasks: BackgroundTasks, file: UploadFile = File(...), db: Session = Depends(get_db)
+) -> UploadResponse:
     file_path = _save_upload(file)
     document = Document(
         original_filename=file.filename or "unknown",
@@ -43,10 +89,33 @@ def upload_document(file: UploadFile = File(...), db: Session = Depends(get_db))
     db.commit()
     db.refresh(document)
 
-    processed = process_document(db, document)
-    return UploadResponse.from_document(processed)
+    # OCR + extraction can take many seconds; run it off the request path and
+    # let clients poll /api/upload/{id}/status.
+    background_tasks.add_task(_run_pipeline, document.id)
+    return upload_response(document)
+
+
+# Read-only: uses the thread-local SessionScoped registry instead of a
+# Depends-managed session (see app.database).
+@router.get("/{document_id}/status", response_model=None)
+def upload_status(document_id: str, request: Request) -> Response:
+    db = SessionScoped()
+    try:
+        row = db.execute(_STATUS_STMT, {"document_id": document_id}).first()
+    finally:
+        SessionScoped.remove()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Document not found")
 
+    # Conditional requests compare an ETag that includes the status itself:
+    # timestamps have one-second granularity, and the uploaded→processed
+    # transition usually lands within the same second the document was
+    # created, so an If-Modified-Since poller would 304 on "uploaded" forever.
+    etag = etag_for(row.id, row.status, row.updated_at)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
 
-@router.get("/{document_id}/status", response_model=UploadResponse)
-def upload_status(document_id: str, db: Session = Depends(get_db)) -> UploadResponse:
-    return UploadResponse.from_document(get_document_or_404(db, document_id))
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=1"}
+    if row.status == DocumentStatus.uploaded:
+        headers["Retry-After"] = "1"
+    return OrjsonResponse(upload_response(row), headers=headers)
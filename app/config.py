@@ -8,6 +8,10 @@ class Settings(BaseSettings):
     database_url: str
     openai_api_key: str | None = None
     openai_model: str
+    openai_rpm: int = 60
+    openai_tpm: int = 90_000
+    max_concurrent_llm: int = 4
+    max_prompt_tokens: int = 3000
     confidence_threshold: float
     upload_dir: str
     ocr_dir: str
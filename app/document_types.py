@@ -5,7 +5,8 @@ Used by extractor (fallback regex + validation) and pipeline (critical field che
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 
 
 @dataclass(frozen=True)
@@ -13,23 +14,36 @@ class FieldDef:
     name: str
     regex: str
     critical: bool = False
+    # Compiled once at registry definition so consumers never pay per-call
+    # re-cache lookups (or evictions from Python's bounded pattern cache).
+    # Patterns are written in lowercase ASCII and matched against lowercased
+    # text, so no IGNORECASE case-folding runs per character.
+    pattern: re.Pattern[str] = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        # re.ASCII keeps \s/\w/\b on the byte-class fast path instead of
+        # consulting Unicode property tables per character.
+        object.__setattr__(self, "pattern", re.compile(self.regex, re.ASCII))
 
+
+# OCR output here is ASCII; explicit [ \t]/[a-z0-9] classes skip the Unicode
+# property walks that \s and IGNORECASE would force per character. Extracted
+# values are sliced from the original text by offset, so casing is preserved.
 FIELD_REGISTRY: dict[str, list[FieldDef]] = {
     "insurance_claim": [
-        FieldDef("claim_number", r"(?:claim\s*(?:number|#)?\s*[:\-]?\s*([A-Z0-9\-]+))", critical=True),
-        FieldDef("claimant_name", r"(?:claimant(?:\sname)?\s*[:\-]?\s*([A-Za-z ,.'-]+))"),
-        FieldDef("date_of_service", r"(?:date of service\s*[:\-]?\s*([0-9/\-]{6,12}))", critical=True),
-        FieldDef("total_amount", r"(?:total(?: amount)?\s*[:\-]?\s*(\$?[0-9,]+\.[0-9]{2}))", critical=True),
-        FieldDef("provider_name", r"(?:provider(?: name)?\s*[:\-]?\s*([A-Za-z0-9 ,.'-]+))"),
-        FieldDef("policy_number", r"(?:policy(?: number|#)?\s*[:\-]?\s*([A-Z0-9\-]+))"),
+        FieldDef("claim_number", r"(?:claim[ \t]*(?:number|#)?[ \t]*[:\-]?[ \t]*([a-z0-9\-]+))", critical=True),
+        FieldDef("claimant_name", r"(?:claimant(?:[ \t]name)?[ \t]*[:\-]?[ \t]*([a-z ,.'-]+))"),
+        FieldDef("date_of_service", r"(?:date of service[ \t]*[:\-]?[ \t]*([0-9/\-]{6,12}))", critical=True),
+        FieldDef("total_amount", r"(?:total(?: amount)?[ \t]*[:\-]?[ \t]*(\$?[0-9,]+\.[0-9]{2}))", critical=True),
+        FieldDef("provider_name", r"(?:provider(?: name)?[ \t]*[:\-]?[ \t]*([a-z0-9 ,.'-]+))"),
+        FieldDef("policy_number", r"(?:policy(?: number|#)?[ \t]*[:\-]?[ \t]*([a-z0-9\-]+))"),
     ],
     "medical_bill": [
-        FieldDef("invoice_number", r"(?:invoice(?: number|#)?\s*[:\-]?\s*([A-Z0-9\-]+))", critical=True),
-        FieldDef("patient_name", r"(?:patient(?: name)?\s*[:\-]?\s*([A-Za-z ,.'-]+))"),
-        FieldDef("date_of_service", r"(?:date of service\s*[:\-]?\s*([0-9/\-]{6,12}))", critical=True),
-        FieldDef("total_amount", r"(?:total(?: amount)?\s*[:\-]?\s*(\$?[0-9,]+\.[0-9]{2}))", critical=True),
-        FieldDef("provider_name", r"(?:provider(?: name)?\s*[:\-]?\s*([A-Za-z0-9 ,.'-]+))"),
+        FieldDef("invoice_number", r"(?:invoice(?: number|#)?[ \t]*[:\-]?[ \t]*([a-z0-9\-]+))", critical=True),
+        FieldDef("patient_name", r"(?:patient(?: name)?[ \t]*[:\-]?[ \t]*([a-z ,.'-]+))"),
+        FieldDef("date_of_service", r"(?:date of service[ \t]*[:\-]?[ \t]*([0-9/\-]{6,12}))", critical=True),
+        FieldDef("total_amount", r"(?:total(?: amount)?[ \t]*[:\-]?[ \t]*(\$?[0-9,]+\.[0-9]{2}))", critical=True),
+        FieldDef("provider_name", r"(?:provider(?: name)?[ \t]*[:\-]?[ \t]*([a-z0-9 ,.'-]+))"),
     ],
 }
 
@@ -11,6 +11,7 @@ from app.api.review import router as review_router
 from app.api.upload import router as upload_router
 from app.config import settings
 from app.database import Base, engine
+from app.responses import OrjsonResponse
 
 
 @asynccontextmanager
@@ -23,7 +24,9 @@ async def lifespan(_app: FastAPI):
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name, lifespan=lifespan)
+    # orjson renders every JSON response; large extraction payloads are the
+    # common case and stdlib json.dumps is the slowest step of the default path.
+    app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=OrjsonResponse)
 
     @app.get("/", include_in_schema=False)
     def root() -> RedirectResponse:
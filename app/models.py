@@ -3,9 +3,22 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
-from uuid import uuid4
-
-from sqlalchemy import JSON, DateTime, Enum as SQLEnum, Float, ForeignKey, Integer, String, Text
+from uuid import UUID, uuid4
+
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Enum as SQLEnum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    TypeDecorator,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -15,6 +28,42 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+class UUIDKey(TypeDecorator):
+    """Canonical UUID string in Python, 16 raw bytes on disk.
+
+    Storing 16 bytes instead of a 36-char string more than halves the key
+    bytes in every index page and join comparison; on Postgres the native
+    UUID type is used instead.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(PG_UUID())
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return str(value)
+        try:
+            return UUID(str(value)).bytes
+        except ValueError:
+            # Malformed ids (bad path params) compare against NULL and match
+            # nothing, so lookups fall through to the usual 404.
+            return None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return str(value)
+        return str(UUID(bytes=value))
+
+
 class DocumentStatus(str, Enum):
     uploaded = "uploaded"
     processed = "processed"
@@ -33,7 +82,7 @@ class ReviewState(str, Enum):
 class Document(Base):
     __tablename__ = "documents"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=lambda: str(uuid4()))
     original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
     content_type: Mapped[str] = mapped_column(String(100), nullable=False)
     file_path: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -61,8 +110,14 @@ class Document(Base):
 class Extraction(Base):
     __tablename__ = "extractions"
 
+    # Satisfies both the document_id filter and the id ORDER BY of the
+    # latest-extraction lookup in one index walk, no sort step. Versions are
+    # assigned in insert order, so the highest id per document is also the
+    # highest version and the index doesn't need the version column.
+    __table_args__ = (Index("ix_extractions_doc_id", "document_id", "id"),)
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    document_id: Mapped[str] = mapped_column(String(36), ForeignKey("documents.id"), nullable=False, index=True)
+    document_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("documents.id"), nullable=False)
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     review_state: Mapped[ReviewState] = mapped_column(
         SQLEnum(ReviewState, native_enum=False),
@@ -0,0 +1,98 @@
+"""Async LLM extraction with bounded concurrency and provider rate limiting.
+
+Used when several documents need extraction but batching into one prompt
+isn't possible (e.g. latency-sensitive single-document results): the network
+round-trips overlap instead of serializing, while a token bucket keeps the
+aggregate request/token rate inside the provider's RPM/TPM budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import orjson
+
+from app.config import settings
+from app.processors.extractor import (
+    EXTRACTION_PROMPT,
+    _ensure_fields,
+    _fallback_extraction,
+    _result_from_payload,
+    _truncate_to_tokens,
+)
+from app.schemas import ExtractionResult, OCRResult
+
+
+class RateLimiter:
+    """Token bucket refilled continuously at rpm/60 requests and tpm/60 tokens per second."""
+
+    def __init__(self, rpm: int, tpm: int) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60.0)
+
+    async def acquire(self, tokens: int) -> None:
+        while True:
+            async with self._lock:
+                self._refill()
+                if self._requests >= 1.0 and self._tokens >= tokens:
+                    self._requests -= 1.0
+                    self._tokens -= tokens
+                    return
+                request_wait = (1.0 - self._requests) * 60.0 / self.rpm
+                token_wait = (tokens - self._tokens) * 60.0 / self.tpm
+            await asyncio.sleep(max(request_wait, token_wait, 0.05))
+
+
+def _estimate_tokens(prompt: str) -> int:
+    # ~4 chars per token for English text; close enough for throttling.
+    return len(prompt) // 4 + 1
+
+
+async def _extract_with_openai_async(ocr: OCRResult, limiter: RateLimiter) -> ExtractionResult:
+    from openai import AsyncOpenAI
+
+    prompt = f"{EXTRACTION_PROMPT}\n\nOCR TEXT:\n{_truncate_to_tokens(ocr.full_text)}"
+    await limiter.acquire(_estimate_tokens(prompt))
+
+    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    response = await client.chat.completions.create(
+        model=settings.openai_model,
+        messages=[
+            {"role": "system", "content": "You extract structured medical and insurance fields."},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.0,
+    )
+    payload_text = (response.choices[0].message.content or "").strip()
+    cleaned = payload_text.removeprefix("```json").removesuffix("```").strip()
+    return _result_from_payload(orjson.loads(cleaned), ocr)
+
+
+async def extract_structured_data_concurrent(ocrs: list[OCRResult]) -> list[ExtractionResult]:
+    """Extract each document with its own LLM call, overlapped up to the rate budget."""
+    if not settings.openai_api_key:
+        results = [_fallback_extraction(ocr) for ocr in ocrs]
+    else:
+        limiter = RateLimiter(settings.openai_rpm, settings.openai_tpm)
+        semaphore = asyncio.Semaphore(settings.max_concurrent_llm)
+
+        async def extract_one(ocr: OCRResult) -> ExtractionResult:
+            async with semaphore:
+                return await _extract_with_openai_async(ocr, limiter)
+
+        results = list(await asyncio.gather(*(extract_one(ocr) for ocr in ocrs)))
+    for result in results:
+        result.fields = _ensure_fields(result.fields, result.document_type)
+    return results
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import re
+from functools import lru_cache
 from typing import Any
 
+import orjson
+
 from app.config import settings
 from app.document_types import FIELD_REGISTRY, required_field_names
 from app.schemas import (
+    EXTRACTED_FIELD_MAP_ADAPTER,
+    LINE_ITEM_LIST_ADAPTER,
     ExtractedField,
     ExtractionResult,
     LineItemExtraction,
     OCRResult,
     SourceBBox,
     SourceEvidence,
+    validate_extracted_field,
+    validate_source_bbox,
+    validate_source_evidence,
 )
 
 # ---------------------------------------------------------------------------
@@ -22,35 +30,71 @@ from app.schemas import (
 INSURANCE_SIGNALS = ["claim", "policy", "claimant", "insurance"]
 MEDICAL_SIGNALS = ["invoice", "cpt", "medical", "patient", "provider bill"]
 
+# Longest-first so a longer signal wins at a shared prefix ("claimant" over
+# "claim"); one finditer walk replaces nine full-text substring scans.
+_SIGNALS_PATTERN = re.compile(
+    "|".join(re.escape(token) for token in sorted(INSURANCE_SIGNALS + MEDICAL_SIGNALS, key=len, reverse=True)),
+    re.ASCII,
+)
+
+# Compiled once at import; per-document calls go straight to the C-level
+# Pattern methods with no re-cache lookups. re.ASCII keeps \s on the
+# byte-class fast path (OCR text here is ASCII).
+_NON_NUMERIC_PATTERN = re.compile(r"[^0-9.]", re.ASCII)
+_LINE_ITEM_PATTERN = re.compile(
+    r"([A-Za-z][A-Za-z0-9\s\-]{2,40})\s+([A-Z0-9]{3,12})\s+\$?([0-9]+\.[0-9]{2})", re.ASCII
+)
+
 
 def _detect_document_type(text: str) -> str:
-    normalized = text.lower()
-    ins = sum(token in normalized for token in INSURANCE_SIGNALS)
-    med = sum(token in normalized for token in MEDICAL_SIGNALS)
+    found = {match.group(0) for match in _SIGNALS_PATTERN.finditer(text.lower())}
+    # Count presence, not occurrences, like the old per-signal substring
+    # checks; a found longer signal also implies any signal it contains.
+    ins = sum(any(signal in token for token in found) for signal in INSURANCE_SIGNALS)
+    med = sum(any(signal in token for token in found) for signal in MEDICAL_SIGNALS)
     return "insurance_claim" if ins >= med else "medical_bill"
 
 
 def _safe_amount(value: str | None) -> float | None:
     if not value:
         return None
-    clean = re.sub(r"[^0-9.]", "", value)
+    clean = _NON_NUMERIC_PATTERN.sub("", value)
     try:
         return float(clean) if clean else None
     except ValueError:
         return None
 
 
-def _closest_word_evidence(quote: str, ocr: OCRResult) -> SourceEvidence:
-    token = quote.split(":")[-1].strip().split(" ")[0].lower()
+WordIndex = dict[str, tuple[int, SourceBBox]]
+
+
+def _build_word_index(ocr: OCRResult) -> WordIndex:
+    """Map normalized word -> (page_number, bbox), first occurrence wins.
+
+    Built once per document so each evidence lookup is a dict hit instead of
+    an O(pages x words) scan per extracted field.
+    """
+    index: WordIndex = {}
     for page in ocr.pages:
         for word in page.words:
-            if word.text.lower().strip(",:.$") == token and word.bbox is not None:
-                return SourceEvidence(
-                    quote=quote,
-                    bbox=SourceBBox(x=word.bbox.x, y=word.bbox.y, width=word.bbox.width, height=word.bbox.height),
-                    page_number=page.page_number,
-                )
-    return SourceEvidence(quote=quote, bbox=None, page_number=None)
+            if word.bbox is not None:
+                index.setdefault(word.text.lower().strip(",:.$"), (page.page_number, word.bbox))
+    return index
+
+
+def _closest_word_evidence(quote: str, word_index: WordIndex) -> SourceEvidence:
+    token = quote.split(":")[-1].strip().split(" ")[0].lower()
+    hit = word_index.get(token)
+    if hit is None:
+        return validate_source_evidence({"quote": quote, "bbox": None, "page_number": None})
+    page_number, bbox = hit
+    return validate_source_evidence(
+        {
+            "quote": quote,
+            "bbox": validate_source_bbox({"x": bbox.x, "y": bbox.y, "width": bbox.width, "height": bbox.height}),
+            "page_number": page_number,
+        }
+    )
 
 
 def _ensure_fields(fields: dict[str, ExtractedField], doc_type: str) -> dict[str, ExtractedField]:
@@ -63,23 +107,61 @@ def _ensure_fields(fields: dict[str, ExtractedField], doc_type: str) -> dict[str
 # Fallback (regex) extraction
 # ---------------------------------------------------------------------------
 
-def _field_from_regex(text: str, pattern: str, confidence: float = 0.55) -> ExtractedField:
-    match = re.search(pattern, text, flags=re.IGNORECASE)
-    if not match:
-        return ExtractedField(value=None, confidence=0.2, evidence=[])
-    quote = match.group(0).strip()
-    value = match.group(1).strip() if match.lastindex else quote
-    return ExtractedField(
-        value=value,
-        confidence=confidence,
-        evidence=[SourceEvidence(quote=quote, bbox=None, page_number=None)],
+# One alternation per doc type: a single linear scan over the OCR text finds
+# candidate positions for every field instead of one full-text search per field.
+# Patterns are lowercase ASCII and run against lowercased text.
+_FALLBACK_PATTERNS: dict[str, re.Pattern[str]] = {
+    doc_type: re.compile("|".join(f"(?P<{fd.name}>{fd.regex})" for fd in defs), re.ASCII)
+    for doc_type, defs in FIELD_REGISTRY.items()
+}
+
+
+def _field_from_match(match: re.Match[str], text: str, confidence: float = 0.55) -> ExtractedField:
+    # Slice from the original text by offset so values keep their casing even
+    # though the match ran on the lowercased copy.
+    quote = text[match.start() : match.end()].strip()
+    value = text[match.start(1) : match.end(1)].strip() if match.lastindex else quote
+    return validate_extracted_field(
+        {
+            "value": value,
+            "confidence": confidence,
+            "evidence": [validate_source_evidence({"quote": quote, "bbox": None, "page_number": None})],
+        }
     )
 
 
+def _fallback_fields(text: str, lowered: str, doc_type: str) -> dict[str, ExtractedField]:
+    fields: dict[str, ExtractedField] = {}
+    remaining = {fd.name: fd for fd in FIELD_REGISTRY[doc_type]}
+    combined = _FALLBACK_PATTERNS[doc_type]
+    pos = 0
+    while remaining:
+        hit = combined.search(lowered, pos)
+        if hit is None:
+            break
+        # At each candidate position, anchor every still-missing field pattern
+        # and keep the longest match, so a prefix field (e.g. "claim" inside
+        # "claimant") cannot swallow another field's text.
+        best_name: str | None = None
+        best_match: re.Match[str] | None = None
+        for name, fd in remaining.items():
+            candidate = fd.pattern.match(lowered, hit.start())
+            if candidate and (best_match is None or candidate.end() > best_match.end()):
+                best_name, best_match = name, candidate
+        if best_match is not None:
+            fields[best_name] = _field_from_match(best_match, text)
+            del remaining[best_name]
+        # Advance one char, not past the match: another field's text may start
+        # inside this span (e.g. "Claim\nClaimant: ..." on separate lines).
+        pos = hit.start() + 1
+    for name in remaining:
+        fields[name] = ExtractedField(value=None, confidence=0.2, evidence=[])
+    return fields
+
+
 def _extract_line_items_fallback(text: str) -> list[LineItemExtraction]:
     rows: list[LineItemExtraction] = []
-    pattern = re.compile(r"([A-Za-z][A-Za-z0-9\s\-]{2,40})\s+([A-Z0-9]{3,12})\s+\$?([0-9]+\.[0-9]{2})")
-    for match in pattern.finditer(text):
+    for match in _LINE_ITEM_PATTERN.finditer(text):
         rows.append(
             LineItemExtraction(
                 service=match.group(1).strip(),
@@ -107,8 +189,9 @@ def _coerce_total_amount(fields: dict[str, ExtractedField]) -> None:
 
 def _fallback_extraction(ocr: OCRResult) -> ExtractionResult:
     text = ocr.full_text
+    lowered = text.lower()
     doc_type = _detect_document_type(text)
-    fields = {fd.name: _field_from_regex(text, fd.regex) for fd in FIELD_REGISTRY[doc_type]}
+    fields = _fallback_fields(text, lowered, doc_type)
     _coerce_total_amount(fields)
     return ExtractionResult(
         document_type=doc_type,
@@ -139,62 +222,207 @@ Use field names:
 - medical_bill: invoice_number, patient_name, date_of_service, total_amount, provider_name
 """
 
+EXTRACTION_PROMPT_BATCH = EXTRACTION_PROMPT + """
+You will receive several documents, each introduced by a "=== DOC <n> ===" marker.
+Return a JSON array with exactly one object (in the format above) per document, in input order.
+"""
+
+# Per-request batching limits: per-doc text is truncated like the single-doc
+# path, and a batch stops growing before the combined prompt gets oversized.
+MAX_DOC_CHARS = 12000
+MAX_BATCH_DOCS = 5
+MAX_BATCH_CHARS = 48000
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(settings.openai_model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _truncate_to_tokens(text: str) -> str:
+    """Clip text to settings.max_prompt_tokens actual model tokens.
+
+    A character slice over- or under-shoots by 2x depending on how numeric
+    or punctuation-heavy the document is; encoding once gives an exact cut.
+    """
+    ids = _encoder().encode(text)
+    if len(ids) <= settings.max_prompt_tokens:
+        return text
+    return _encoder().decode(ids[: settings.max_prompt_tokens])
+
 
-def _coerce_field(raw_field: dict[str, Any], ocr: OCRResult) -> ExtractedField:
+def _field_dict(raw_field: dict[str, Any], word_index: WordIndex) -> dict[str, Any]:
     quote = raw_field.get("quote")
-    evidence = [_closest_word_evidence(str(quote), ocr)] if quote else []
-    return ExtractedField(
-        value=raw_field.get("value"),
-        confidence=float(raw_field.get("confidence", 0.0)),
-        evidence=evidence,
-    )
+    evidence = [_closest_word_evidence(str(quote), word_index)] if quote else []
+    return {
+        "value": raw_field.get("value"),
+        "confidence": float(raw_field.get("confidence", 0.0)),
+        "evidence": evidence,
+    }
 
 
-def _coerce_line_item(row: dict[str, Any], ocr: OCRResult) -> LineItemExtraction:
+def _line_item_dict(row: dict[str, Any], word_index: WordIndex) -> dict[str, Any]:
     quote = row.get("quote")
-    evidence = [_closest_word_evidence(str(quote), ocr)] if quote else []
-    return LineItemExtraction(
-        service=row.get("service"),
-        code=row.get("code"),
-        amount=_safe_amount(str(row.get("amount"))) if row.get("amount") is not None else None,
-        confidence=float(row.get("confidence", 0.0)),
-        evidence=evidence,
+    evidence = [_closest_word_evidence(str(quote), word_index)] if quote else []
+    return {
+        "service": row.get("service"),
+        "code": row.get("code"),
+        "amount": _safe_amount(str(row.get("amount"))) if row.get("amount") is not None else None,
+        "confidence": float(row.get("confidence", 0.0)),
+        "evidence": evidence,
+    }
+
+
+def _result_from_payload(payload: dict[str, Any], ocr: OCRResult) -> ExtractionResult:
+    word_index = _build_word_index(ocr)
+    # Batch-validate whole collections: one pydantic-core crossing per
+    # container instead of one per field/row.
+    fields = EXTRACTED_FIELD_MAP_ADAPTER.validate_python(
+        {key: _field_dict(val, word_index) for key, val in payload.get("fields", {}).items()}
+    )
+    line_items = LINE_ITEM_LIST_ADAPTER.validate_python(
+        [_line_item_dict(row, word_index) for row in payload.get("line_items", [])]
+    )
+    return ExtractionResult(
+        document_type=payload.get("document_type", _detect_document_type(ocr.full_text)),
+        fields=fields,
+        line_items=line_items,
+        raw_response=payload,
     )
 
 
-def _extract_with_openai(ocr: OCRResult) -> ExtractionResult:
+def _complete(prompt: str) -> Any:
     from openai import OpenAI
 
     client = OpenAI(api_key=settings.openai_api_key)
-    response = client.chat.completions.create(
+    # Stream the completion: tokens are consumed as they are generated, so
+    # the first bytes arrive immediately instead of after the full multi-
+    # second generation, and transient network jitter is hidden per chunk.
+    stream = client.chat.completions.create(
         model=settings.openai_model,
         messages=[
             {"role": "system", "content": "You extract structured medical and insurance fields."},
-            {"role": "user", "content": f"{EXTRACTION_PROMPT}\n\nOCR TEXT:\n{ocr.full_text[:12000]}"},
+            {"role": "user", "content": prompt},
         ],
         temperature=0.0,
+        stream=True,
     )
-
-    payload_text = (response.choices[0].message.content or "").strip()
+    parts: list[str] = []
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+    payload_text = "".join(parts).strip()
     cleaned = payload_text.removeprefix("```json").removesuffix("```").strip()
-    payload = json.loads(cleaned)
+    return orjson.loads(cleaned)
 
-    fields = {key: _coerce_field(val, ocr) for key, val in payload.get("fields", {}).items()}
-    line_items = [_coerce_line_item(row, ocr) for row in payload.get("line_items", [])]
 
-    return ExtractionResult(
-        document_type=payload.get("document_type", _detect_document_type(ocr.full_text)),
-        fields=fields,
-        line_items=line_items,
-        raw_response=payload,
-    )
+# Content-addressed cache of LLM payloads: re-uploads and duplicate scans of
+# the same document hash to the same key and skip the paid round-trip
+# entirely (temperature is 0.0, so the response is as good as deterministic).
+_PAYLOAD_CACHE: dict[str, Any] = {}
+_PAYLOAD_CACHE_MAX = 256
+
+
+def _content_key(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _cache_payload(key: str, payload: Any) -> None:
+    if len(_PAYLOAD_CACHE) >= _PAYLOAD_CACHE_MAX:
+        # dicts iterate in insertion order, so this evicts the oldest entry.
+        del _PAYLOAD_CACHE[next(iter(_PAYLOAD_CACHE))]
+    _PAYLOAD_CACHE[key] = payload
+
+
+def _extract_with_openai(ocr: OCRResult) -> ExtractionResult:
+    key = _content_key(ocr.full_text)
+    payload = _PAYLOAD_CACHE.get(key)
+    if payload is None:
+        payload = _complete(f"{EXTRACTION_PROMPT}\n\nOCR TEXT:\n{_truncate_to_tokens(ocr.full_text)}")
+        _cache_payload(key, payload)
+    return _result_from_payload(payload, ocr)
+
+
+def _extract_with_openai_batch(ocrs: list[OCRResult]) -> list[ExtractionResult]:
+    keys = [_content_key(ocr.full_text) for ocr in ocrs]
+    payloads = [_PAYLOAD_CACHE.get(key) for key in keys]
+    missing = [index for index, payload in enumerate(payloads) if payload is None]
+    if missing:
+        sections = "\n\n".join(
+            f"=== DOC {slot} ===\n{_truncate_to_tokens(ocrs[index].full_text)}"
+            for slot, index in enumerate(missing, start=1)
+        )
+        fetched = _complete(f"{EXTRACTION_PROMPT_BATCH}\n\n{sections}")
+        if not isinstance(fetched, list) or len(fetched) != len(missing):
+            raise ValueError(f"Expected {len(missing)} extraction objects, got {fetched!r:.200}")
+        for index, doc_payload in zip(missing, fetched):
+            payloads[index] = doc_payload
+            _cache_payload(keys[index], doc_payload)
+    return [_result_from_payload(doc_payload, ocr) for doc_payload, ocr in zip(payloads, ocrs)]
+
+
+def _batched(ocrs: list[OCRResult]) -> list[list[OCRResult]]:
+    batches: list[list[OCRResult]] = []
+    current: list[OCRResult] = []
+    current_chars = 0
+    for ocr in ocrs:
+        doc_chars = min(len(ocr.full_text), MAX_DOC_CHARS)
+        if current and (len(current) >= MAX_BATCH_DOCS or current_chars + doc_chars > MAX_BATCH_CHARS):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(ocr)
+        current_chars += doc_chars
+    if current:
+        batches.append(current)
+    return batches
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
+def _needs_llm(result: ExtractionResult) -> bool:
+    """True when a fallback pass left critical fields empty or confidence below threshold."""
+    # Imported lazily: the pipeline module imports this one at load time.
+    from app.processors.pipeline import _has_missing_critical, compute_document_confidence
+
+    return _has_missing_critical(result) or compute_document_confidence(result) < settings.confidence_threshold
+
+
 def extract_structured_data(ocr: OCRResult) -> ExtractionResult:
-    result = _extract_with_openai(ocr) if settings.openai_api_key else _fallback_extraction(ocr)
+    # Cascade: the regex fallback is effectively free, so run it first and
+    # only pay for an LLM round-trip when it leaves gaps.
+    fallback = _fallback_extraction(ocr)
+    fallback.fields = _ensure_fields(fallback.fields, fallback.document_type)
+    if not settings.openai_api_key or not _needs_llm(fallback):
+        return fallback
+    result = _extract_with_openai(ocr)
     result.fields = _ensure_fields(result.fields, result.document_type)
     return result
+
+
+def extract_structured_data_batch(ocrs: list[OCRResult]) -> list[ExtractionResult]:
+    """Extract several documents at once, sharing LLM round-trips per batch."""
+    results = [_fallback_extraction(ocr) for ocr in ocrs]
+    for result in results:
+        result.fields = _ensure_fields(result.fields, result.document_type)
+    if not settings.openai_api_key:
+        return results
+
+    # Only the documents the fallback could not finish go to the LLM.
+    pending = [(index, ocr) for index, ocr in enumerate(ocrs) if _needs_llm(results[index])]
+    if pending:
+        llm_results = [
+            result
+            for batch in _batched([ocr for _, ocr in pending])
+            for result in _extract_with_openai_batch(batch)
+        ]
+        for (index, _), result in zip(pending, llm_results):
+            result.fields = _ensure_fields(result.fields, result.document_type)
+            results[index] = result
+    return results
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import io
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from app.schemas import OCRPage, OCRResult, OCRWord, SourceBBox
+from app.schemas import OCRPage, OCRResult, validate_ocr_word, validate_source_bbox
 
 if TYPE_CHECKING:
     from PIL import Image as ImageModule
@@ -13,30 +14,48 @@ if TYPE_CHECKING:
 def _ocr_image(image: ImageModule.Image, page_number: int) -> OCRPage:
     import pytesseract
 
-    text = pytesseract.image_to_string(image) or ""
+    # A single image_to_data call yields both words and layout; running
+    # image_to_string as well would re-run the whole Tesseract pipeline on
+    # the same image just to get text we can reassemble from the words.
     data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
 
-    words: list[OCRWord] = []
-    for idx in range(len(data.get("text", []))):
-        raw_text = (data["text"][idx] or "").strip()
+    # Hoist the column lists once; the loop below then runs on plain local
+    # list indexing instead of repeated dict lookups per word.
+    texts = data.get("text", [])
+    confs = data["conf"] if texts else []
+    lefts, tops = data.get("left", []), data.get("top", [])
+    widths, heights = data.get("width", []), data.get("height", [])
+    blocks, pars, line_nums = data.get("block_num", []), data.get("par_num", []), data.get("line_num", [])
+
+    # Pre-bound core validators: this loop runs once per recognized word.
+    words = []
+    lines: dict[tuple[int, int, int], list[str]] = {}
+    for idx, raw in enumerate(texts):
+        raw_text = (raw or "").strip()
         if not raw_text:
             continue
-        confidence = float(data["conf"][idx]) if data["conf"][idx] not in ("-1", -1) else 0.0
-        bbox = SourceBBox(
-            x=float(data["left"][idx]),
-            y=float(data["top"][idx]),
-            width=float(data["width"][idx]),
-            height=float(data["height"][idx]),
+        confidence = float(confs[idx]) if confs[idx] not in ("-1", -1) else 0.0
+        bbox = validate_source_bbox(
+            {
+                "x": float(lefts[idx]),
+                "y": float(tops[idx]),
+                "width": float(widths[idx]),
+                "height": float(heights[idx]),
+            }
         )
         words.append(
-            OCRWord(
-                text=raw_text,
-                confidence=max(min(confidence / 100.0, 1.0), 0.0),
-                bbox=bbox,
-                page_number=page_number,
+            validate_ocr_word(
+                {
+                    "text": raw_text,
+                    "confidence": max(min(confidence / 100.0, 1.0), 0.0),
+                    "bbox": bbox,
+                    "page_number": page_number,
+                }
             )
         )
+        lines.setdefault((blocks[idx], pars[idx], line_nums[idx]), []).append(raw_text)
 
+    text = "\n".join(" ".join(tokens) for tokens in lines.values())
     return OCRPage(page_number=page_number, text=text, words=words)
 
 
@@ -54,12 +73,23 @@ def run_ocr(file_path: str) -> OCRResult:
     if suffix == ".pdf":
         import fitz
 
-        pages: list[OCRPage] = []
+        # Rendering stays serial (a fitz document isn't thread-safe), but
+        # Tesseract releases the GIL, so pages OCR in parallel across cores.
+        images: list[ImageModule.Image] = []
         with fitz.open(path) as pdf_doc:
-            for index, pdf_page in enumerate(pdf_doc, start=1):
+            for pdf_page in pdf_doc:
                 pix = pdf_page.get_pixmap(dpi=220)
-                image = Image.open(io.BytesIO(pix.tobytes("png"))).convert("RGB")
-                pages.append(_ocr_image(image, page_number=index))
+                if pix.alpha:
+                    pix = fitz.Pixmap(fitz.csRGB, pix)
+                # Wrap the raw pixmap buffer directly — no PNG encode/decode
+                # round-trip per page.
+                images.append(Image.frombytes("RGB", (pix.width, pix.height), pix.samples))
+
+        if len(images) <= 1:
+            pages = [_ocr_image(image, page_number=index) for index, image in enumerate(images, start=1)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, len(images))) as executor:
+                pages = list(executor.map(_ocr_image, images, range(1, len(images) + 1)))
 
         return OCRResult(
             full_text="\n".join(p.text for p in pages if p.text),
@@ -1,43 +1,58 @@
 from __future__ import annotations
 
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-from sqlalchemy import func, select
+import orjson
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.document_types import critical_field_names
 from app.models import Document, DocumentStatus, Extraction, FieldEvidence, LineItem, ReviewState
-from app.processors.extractor import extract_structured_data
+from app.processors.extractor import extract_structured_data, extract_structured_data_batch
 from app.processors.ocr import run_ocr
-from app.schemas import ExtractedField, ExtractionResult
+from app.schemas import ExtractedField, ExtractionResult, OCRResult, SourceBBox
 
 
 # ---------------------------------------------------------------------------
 # Confidence scoring
 # ---------------------------------------------------------------------------
 
+def _is_empty(value: object) -> bool:
+    # Single truthiness check (no tuple build per call); numeric zero is a
+    # real extracted value, not an empty one.
+    return not value and value != 0
+
+
 def _score_field(field: ExtractedField) -> float:
-    if field.value in (None, "", []):
+    if _is_empty(field.value):
         return 0.0
     return field.confidence
 
 
-def compute_document_confidence(result: ExtractionResult) -> float:
-    field_scores = [_score_field(f) for f in result.fields.values()]
-    line_item_scores = [row.confidence for row in result.line_items] or [0.5]
-
+@lru_cache(maxsize=256)
+def _confidence_from_scores(field_scores: tuple[float, ...], line_item_scores: tuple[float, ...]) -> float:
     weighted = (sum(field_scores) / max(len(field_scores), 1)) * 0.8 + (
         sum(line_item_scores) / max(len(line_item_scores), 1)
     ) * 0.2
     return round(max(min(weighted, 1.0), 0.0), 4)
 
 
+def compute_document_confidence(result: ExtractionResult) -> float:
+    # Memoized on the score tuples: the cascade check and persistence both
+    # score the same result, and identical documents hash to the same key.
+    return _confidence_from_scores(
+        tuple(_score_field(f) for f in result.fields.values()),
+        tuple(row.confidence for row in result.line_items) or (0.5,),
+    )
+
+
 def _has_missing_critical(result: ExtractionResult) -> bool:
     for name in critical_field_names(result.document_type):
         field = result.fields.get(name)
-        if field is None or field.value in (None, ""):
+        if field is None or _is_empty(field.value):
             return True
     return False
 
@@ -46,87 +61,183 @@ def _has_missing_critical(result: ExtractionResult) -> bool:
 # Persistence helpers
 # ---------------------------------------------------------------------------
 
+# Built once at import like the statements in app.queries; per-call work is
+# just parameter binding, and the compiled SQL stays hot in SQLAlchemy's
+# compilation cache.
+_MAX_VERSION_STMT = select(func.max(Extraction.version)).where(
+    Extraction.document_id == bindparam("document_id")
+)
+
+
 def _next_extraction_version(db: Session, document_id: str) -> int:
-    current = db.scalar(select(func.max(Extraction.version)).where(Extraction.document_id == document_id))
+    current = db.scalar(_MAX_VERSION_STMT, {"document_id": document_id})
     return (current or 0) + 1
 
 
-def _persist_snapshot(directory: str, document_id: str, payload: dict) -> None:
+# Snapshot writes are advisory artifacts; serializing and fsyncing them on
+# the pipeline thread would add tens of ms to every document.
+_SNAPSHOT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="snapshot")
+
+
+def _write_snapshot(directory: str, document_id: str, payload: dict) -> None:
     target = Path(directory)
     target.mkdir(parents=True, exist_ok=True)
-    (target / f"{document_id}.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    (target / f"{document_id}.json").write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+
+
+def _persist_snapshot(directory: str, document_id: str, payload: dict) -> Future:
+    return _SNAPSHOT_POOL.submit(_write_snapshot, directory, document_id, payload)
+
+
+@lru_cache(maxsize=128)
+def _load_snapshot_cached(path: str, mtime_ns: int) -> dict:
+    return orjson.loads(Path(path).read_bytes())
+
+
+def load_snapshot(directory: str, document_id: str) -> dict | None:
+    """Read a persisted OCR/extraction snapshot, caching parses by (path, mtime).
+
+    Snapshots are immutable once written, so warm hits skip both the read
+    syscall and the JSON parse; mtime in the key invalidates on rewrite.
+    """
+    path = Path(directory) / f"{document_id}.json"
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return _load_snapshot_cached(str(path), stat.st_mtime_ns)
+
+
+def _bbox_json(bbox: SourceBBox | None) -> dict | None:
+    # Hand-rolled dict instead of model_dump(): SourceBBox is four floats,
+    # and the generic serializer walk per evidence row adds up.
+    if bbox is None:
+        return None
+    return {"x": bbox.x, "y": bbox.y, "width": bbox.width, "height": bbox.height}
 
 
 def _save_field_evidences(db: Session, extraction_id: int, result: ExtractionResult) -> None:
-    for field_name, field in result.fields.items():
-        evidences = field.evidence or [None]
-        for ev in evidences:
-            db.add(FieldEvidence(
-                extraction_id=extraction_id,
-                field_name=field_name,
-                field_value=None if field.value is None else str(field.value),
-                confidence=field.confidence,
-                quote=ev.quote if ev else None,
-                bbox=ev.bbox.model_dump() if ev and ev.bbox else None,
-                page_number=ev.page_number if ev else None,
-            ))
+    # Plain dicts + bulk_insert_mappings batch the INSERTs and skip per-row
+    # ORM instance and unit-of-work overhead.
+    rows = [
+        {
+            "extraction_id": extraction_id,
+            "field_name": field_name,
+            "field_value": None if field.value is None else str(field.value),
+            "confidence": field.confidence,
+            "quote": ev.quote if ev else None,
+            "bbox": _bbox_json(ev.bbox) if ev else None,
+            "page_number": ev.page_number if ev else None,
+        }
+        for field_name, field in result.fields.items()
+        for ev in (field.evidence or [None])
+    ]
+    if rows:
+        db.bulk_insert_mappings(FieldEvidence, rows)
 
 
 def _save_line_items(db: Session, extraction_id: int, result: ExtractionResult) -> None:
+    rows = []
     for idx, row in enumerate(result.line_items):
         ev = row.evidence[0] if row.evidence else None
-        db.add(LineItem(
-            extraction_id=extraction_id,
-            row_index=idx,
-            service=row.service,
-            code=row.code,
-            amount=row.amount,
-            confidence=row.confidence,
-            evidence_quote=ev.quote if ev else None,
-            evidence_bbox=ev.bbox.model_dump() if ev and ev.bbox else None,
-            page_number=ev.page_number if ev else None,
-        ))
+        rows.append({
+            "extraction_id": extraction_id,
+            "row_index": idx,
+            "service": row.service,
+            "code": row.code,
+            "amount": row.amount,
+            "confidence": row.confidence,
+            "evidence_quote": ev.quote if ev else None,
+            "evidence_bbox": _bbox_json(ev.bbox) if ev else None,
+            "page_number": ev.page_number if ev else None,
+        })
+    if rows:
+        db.bulk_insert_mappings(LineItem, rows)
 
 
 # ---------------------------------------------------------------------------
 # Main pipeline
 # ---------------------------------------------------------------------------
 
+def _persist_result(
+    db: Session, document: Document, ocr_result: OCRResult, extraction_result: ExtractionResult
+) -> Document:
+    confidence = compute_document_confidence(extraction_result)
+    review_required = confidence < settings.confidence_threshold or _has_missing_critical(extraction_result)
+
+    document.document_type = extraction_result.document_type
+    document.confidence_score = confidence
+    document.status = DocumentStatus.review_required if review_required else DocumentStatus.processed
+    document.error_message = None
+
+    # model_dump walks the whole result tree; dump each payload once and
+    # share it between the DB column and the snapshot.
+    extraction_payload = extraction_result.model_dump(mode="json")
+
+    extraction_model = Extraction(
+        document_id=document.id,
+        version=_next_extraction_version(db, document.id),
+        review_state=ReviewState.pending if review_required else ReviewState.approved,
+        extraction_data=extraction_payload,
+    )
+    db.add(extraction_model)
+    db.flush()
+
+    _save_field_evidences(db, extraction_model.id, extraction_result)
+    _save_line_items(db, extraction_model.id, extraction_result)
+
+    _persist_snapshot(settings.ocr_dir, document.id, ocr_result.model_dump(mode="json"))
+    _persist_snapshot(settings.extraction_dir, document.id, extraction_payload)
+
+    db.add(document)
+    db.commit()
+    db.refresh(document)
+    return document
+
+
+def _mark_failed(db: Session, document: Document, exc: Exception) -> Document:
+    document.status = DocumentStatus.failed
+    document.error_message = str(exc)
+    db.add(document)
+    db.commit()
+    db.refresh(document)
+    return document
+
+
 def process_document(db: Session, document: Document) -> Document:
     try:
         ocr_result = run_ocr(document.file_path)
         extraction_result = extract_structured_data(ocr_result)
-        confidence = compute_document_confidence(extraction_result)
-        review_required = confidence < settings.confidence_threshold or _has_missing_critical(extraction_result)
-
-        document.document_type = extraction_result.document_type
-        document.confidence_score = confidence
-        document.status = DocumentStatus.review_required if review_required else DocumentStatus.processed
-        document.error_message = None
-
-        extraction_model = Extraction(
-            document_id=document.id,
-            version=_next_extraction_version(db, document.id),
-            review_state=ReviewState.pending if review_required else ReviewState.approved,
-            extraction_data=extraction_result.model_dump(mode="json"),
-        )
-        db.add(extraction_model)
-        db.flush()
-
-        _save_field_evidences(db, extraction_model.id, extraction_result)
-        _save_line_items(db, extraction_model.id, extraction_result)
-
-        _persist_snapshot(settings.ocr_dir, document.id, ocr_result.model_dump(mode="json"))
-        _persist_snapshot(settings.extraction_dir, document.id, extraction_result.model_dump(mode="json"))
-
-        db.add(document)
-        db.commit()
-        db.refresh(document)
-        return document
+        return _persist_result(db, document, ocr_result, extraction_result)
     except Exception as exc:  # pragma: no cover
-        document.status = DocumentStatus.failed
-        document.error_message = str(exc)
-        db.add(document)
-        db.commit()
-        db.refresh(document)
-        return document
+        return _mark_failed(db, document, exc)
+
+
+def process_documents(db: Session, documents: list[Document]) -> list[Document]:
+    """Process several uploads together so LLM extraction round-trips are shared.
+
+    OCR failures are isolated per document; the survivors are extracted in
+    batches and persisted exactly like the single-document path.
+    """
+    processed: dict[str, Document] = {}
+    ready: list[tuple[Document, OCRResult]] = []
+    for document in documents:
+        try:
+            ready.append((document, run_ocr(document.file_path)))
+        except Exception as exc:
+            processed[document.id] = _mark_failed(db, document, exc)
+
+    if ready:
+        try:
+            results = extract_structured_data_batch([ocr for _, ocr in ready])
+        except Exception as exc:
+            for document, _ in ready:
+                processed[document.id] = _mark_failed(db, document, exc)
+        else:
+            for (document, ocr_result), extraction_result in zip(ready, results):
+                try:
+                    processed[document.id] = _persist_result(db, document, ocr_result, extraction_result)
+                except Exception as exc:  # pragma: no cover
+                    processed[document.id] = _mark_failed(db, document, exc)
+
+    return [processed[document.id] for document in documents]
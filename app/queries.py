@@ -1,25 +1,65 @@
 from __future__ import annotations
 
 from fastapi import HTTPException
-from sqlalchemy import desc, select
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, bindparam, desc, func, select
+from sqlalchemy.orm import Session, aliased
 
 from app.models import Document, Extraction
 
+# Statements are built once at import time; per-request cost is then just binding
+# parameters, with SQL compilation amortized by SQLAlchemy's compiled-query cache.
+
+# Versions are assigned in insert order (_next_extraction_version runs before
+# each INSERT), so the row with the highest autoincrement id per document is
+# also its highest version. Ordering by id alone lets the planner early-exit
+# off the two-column (document_id, id) index with no sort step.
+_LATEST_EXTRACTION_STMT = (
+    select(Extraction)
+    .where(Extraction.document_id == bindparam("document_id"))
+    .order_by(desc(Extraction.id))
+    .limit(1)
+)
+
+_LATEST_EXTRACTION_ID_SUBQ = (
+    select(func.max(Extraction.id))
+    .where(Extraction.document_id == bindparam("document_id"))
+    .scalar_subquery()
+)
+
+_DOCUMENT_WITH_LATEST_EXTRACTION_STMT = (
+    select(Document, Extraction)
+    .outerjoin(Extraction, Extraction.id == _LATEST_EXTRACTION_ID_SUBQ)
+    .where(Document.id == bindparam("document_id"))
+)
+
+# Ranks extractions per document so set-returning queries (review queue,
+# document listings) can join each document to its latest extraction in one
+# statement instead of one subquery per row.
+_RANKED_EXTRACTIONS = select(
+    Extraction,
+    func.row_number()
+    .over(partition_by=Extraction.document_id, order_by=desc(Extraction.id))
+    .label("rn"),
+).subquery()
+
+LATEST_EXTRACTION = aliased(Extraction, _RANKED_EXTRACTIONS)
+
+LATEST_EXTRACTION_ON = and_(
+    _RANKED_EXTRACTIONS.c.document_id == Document.id, _RANKED_EXTRACTIONS.c.rn == 1
+)
+
 
 def get_document_or_404(db: Session, document_id: str) -> Document:
-    document = db.scalar(select(Document).where(Document.id == document_id))
+    # Session.get hits the identity map first, skipping SQL entirely when the
+    # document was already loaded earlier in the same request.
+    document = db.get(Document, document_id)
     if document is None:
         raise HTTPException(status_code=404, detail="Document not found")
     return document
 
 
 def get_latest_extraction(db: Session, document_id: str) -> Extraction | None:
-    return db.scalar(
-        select(Extraction)
-        .where(Extraction.document_id == document_id)
-        .order_by(desc(Extraction.version), desc(Extraction.id))
-    )
+    return db.scalar(_LATEST_EXTRACTION_STMT, {"document_id": document_id})
 
 
 def get_latest_extraction_or_404(db: Session, document_id: str) -> Extraction:
@@ -27,3 +67,12 @@ def get_latest_extraction_or_404(db: Session, document_id: str) -> Extraction:
     if extraction is None:
         raise HTTPException(status_code=404, detail="Extraction not found")
     return extraction
+
+
+def get_document_with_latest_extraction(db: Session, document_id: str) -> tuple[Document, Extraction | None]:
+    """Fetch a document and its latest extraction in one round-trip (404 if the document is missing)."""
+    row = db.execute(_DOCUMENT_WITH_LATEST_EXTRACTION_STMT, {"document_id": document_id}).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    document, extraction = row
+    return document, extraction
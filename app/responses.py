@@ -0,0 +1,27 @@
+"""orjson-backed JSON response used as the app-wide default.
+
+Rendering goes straight from Python objects to JSON bytes in one C call;
+orjson handles datetimes and str-enums natively, so handlers can return
+plain dicts without a jsonable_encoder pass.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+
+class OrjsonResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def etag_for(*parts: object) -> str:
+    """Build a strong ETag from the values that define a payload's identity."""
+    digest = hashlib.blake2b("|".join(str(p) for p in parts).encode(), digest_size=8)
+    return f'"{digest.hexdigest()}"'
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, TypedDict
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+if TYPE_CHECKING:
+    from app.models import DocumentStatus
 
 
 # ---------------------------------------------------------------------------
@@ -104,27 +107,23 @@ class ExtractionResult(BaseModel):
 
 # ---------------------------------------------------------------------------
 # API response / request DTOs
+#
+# Outbound DTOs are TypedDicts built straight from ORM rows: they only
+# re-serialize data the pipeline already validated on the way in, so paying
+# Pydantic's per-instance validation on every response bought nothing.
+# Inbound payloads (ReviewUpdateRequest, the extraction schemas above) stay
+# as validated BaseModels.
 # ---------------------------------------------------------------------------
 
-class UploadResponse(BaseModel):
+class UploadResponse(TypedDict):
     document_id: str
     status: str
-    document_type: str | None = None
-    confidence_score: float | None = None
-
-    @classmethod
-    def from_document(cls, doc: Any) -> UploadResponse:
-        return cls(
-            document_id=doc.id,
-            status=doc.status.value if hasattr(doc.status, "value") else str(doc.status),
-            document_type=doc.document_type,
-            confidence_score=doc.confidence_score,
-        )
+    document_type: str | None
+    confidence_score: float | None
 
 
-class DocumentSummary(BaseModel):
+class DocumentSummary(TypedDict):
     """Shared base for document list items and review queue entries."""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     original_filename: str
@@ -139,19 +138,10 @@ class DocumentListItem(DocumentSummary):
 
 
 class ReviewQueueItem(DocumentSummary):
-    """Alias with document_id for backward-compatible JSON keys."""
-    document_id: str = ""
+    """Summary plus document_id for backward-compatible JSON keys."""
 
-    @classmethod
-    def from_document(cls, doc: Any) -> ReviewQueueItem:
-        return cls(
-            id=doc.id,
-            document_id=doc.id,
-            original_filename=doc.original_filename,
-            document_type=doc.document_type,
-            confidence_score=doc.confidence_score,
-            status=doc.status.value if hasattr(doc.status, "value") else str(doc.status),
-        )
+    document_id: str
+    extraction: dict[str, Any] | None
 
 
 class DocumentDetail(DocumentSummary):
@@ -160,8 +150,72 @@ class DocumentDetail(DocumentSummary):
     error_message: str | None
     created_at: datetime
     updated_at: datetime
-    extraction: dict[str, Any] | None = None
+    extraction: dict[str, Any] | None
+
+
+def _status_str(status: DocumentStatus) -> str:
+    # The status column maps through SQLEnum, which hands back DocumentStatus
+    # members for ORM instances and core Rows alike, so .value always exists —
+    # no hasattr probe (an exception-catching branch) per response.
+    return status.value
+
+
+def upload_response(doc: Any) -> UploadResponse:
+    return UploadResponse(
+        document_id=doc.id,
+        status=_status_str(doc.status),
+        document_type=doc.document_type,
+        confidence_score=doc.confidence_score,
+    )
+
+
+def review_queue_item(doc: Any, extraction: Any = None) -> ReviewQueueItem:
+    return ReviewQueueItem(
+        id=doc.id,
+        document_id=doc.id,
+        original_filename=doc.original_filename,
+        status=_status_str(doc.status),
+        document_type=doc.document_type,
+        confidence_score=doc.confidence_score,
+        extraction=extraction.extraction_data if extraction is not None else None,
+    )
+
+
+def document_detail(doc: Any, extraction: Any = None) -> DocumentDetail:
+    return DocumentDetail(
+        id=doc.id,
+        original_filename=doc.original_filename,
+        status=_status_str(doc.status),
+        document_type=doc.document_type,
+        confidence_score=doc.confidence_score,
+        content_type=doc.content_type,
+        file_path=doc.file_path,
+        error_message=doc.error_message,
+        created_at=doc.created_at,
+        updated_at=doc.updated_at,
+        extraction=extraction.extraction_data if extraction is not None else None,
+    )
 
 
 class ReviewUpdateRequest(BaseModel):
     extraction_data: dict[str, Any] | None = None
+
+
+# ---------------------------------------------------------------------------
+# Pre-bound core validators for hot construction paths
+#
+# BaseModel(...) reaches pydantic-core through a chain of attribute lookups
+# per call; binding validate_python once lets per-word/per-field loops jump
+# straight to the compiled validator.
+# ---------------------------------------------------------------------------
+
+validate_source_bbox = SourceBBox.__pydantic_validator__.validate_python
+validate_source_evidence = SourceEvidence.__pydantic_validator__.validate_python
+validate_extracted_field = ExtractedField.__pydantic_validator__.validate_python
+validate_line_item = LineItemExtraction.__pydantic_validator__.validate_python
+validate_ocr_word = OCRWord.__pydantic_validator__.validate_python
+
+# Batch adapters for whole collections: one validate_python call crosses into
+# pydantic-core once for the entire container instead of once per element.
+EXTRACTED_FIELD_MAP_ADAPTER = TypeAdapter(dict[str, ExtractedField])
+LINE_ITEM_LIST_ADAPTER = TypeAdapter(list[LineItemExtraction])
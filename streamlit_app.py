@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import html
 import json
+import re
+import time
+from itertools import chain
 
+import orjson
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
 
 CONFIDENCE_THRESHOLD = 0.8
 
@@ -16,40 +22,109 @@ backend_url = st.sidebar.text_input("Backend URL", value="http://127.0.0.1:8000"
 # Helpers
 # ---------------------------------------------------------------------------
 
+# One pooled session for all backend calls: bare requests.get/post would set
+# up and tear down a TCP connection per call.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_maxsize=16))
+_SESSION.mount("https://", HTTPAdapter(pool_maxsize=16))
+
+
+# Memoized by URL for a few seconds: toggling an expander reruns the whole
+# script, and without this every rerun re-issues identical GETs and re-parses
+# the same JSON payloads.
+@st.cache_data(ttl=5, show_spinner=False)
+def _api_get_cached(url: str, timeout: int) -> tuple[int, dict | list | str]:
+    resp = _SESSION.get(url, timeout=timeout)
+    if resp.status_code == 200:
+        return resp.status_code, orjson.loads(resp.content)
+    return resp.status_code, resp.text
+
+
 def api_get(path: str, timeout: int = 15) -> dict | list | None:
     try:
-        resp = requests.get(f"{backend_url}{path}", timeout=timeout)
-        if resp.status_code == 200:
-            return resp.json()
-        st.error(f"GET {path} failed ({resp.status_code}): {resp.text}")
+        status, payload = _api_get_cached(f"{backend_url}{path}", timeout)
     except requests.RequestException as exc:
         st.warning(f"Backend not reachable: {exc}")
+        return None
+    if status == 200:
+        return payload
+    st.error(f"GET {path} failed ({status}): {payload}")
     return None
 
 
-def api_post(path: str, **kwargs) -> dict | None:
+def api_post(path: str, timeout: int = 30, **kwargs) -> dict | None:
+    # Short timeout: the upload endpoint returns 202 immediately and the
+    # pipeline runs in the background, so nothing should hold a socket for
+    # minutes anymore.
     try:
-        resp = requests.post(f"{backend_url}{path}", timeout=300, **kwargs)
-        if resp.status_code == 200:
-            return resp.json()
+        resp = _SESSION.post(f"{backend_url}{path}", timeout=timeout, **kwargs)
+        if resp.status_code in (200, 202):
+            return orjson.loads(resp.content)
         st.error(f"POST {path} failed ({resp.status_code}): {resp.text}")
     except requests.RequestException as exc:
         st.warning(f"Backend not reachable: {exc}")
     return None
 
 
-def render_field(name: str, field: dict) -> None:
+_TERMINAL_STATUSES = {"processed", "review_required", "reviewed", "rejected", "failed"}
+
+
+def poll_document_status(document_id: str, interval: float = 0.5, timeout: float = 300.0) -> dict | None:
+    """Poll the status endpoint until the background pipeline finishes.
+
+    Bypasses the memoized GET cache — its 5s TTL would keep serving stale
+    "uploaded" payloads and stall the loop.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            resp = _SESSION.get(f"{backend_url}/api/upload/{document_id}/status", timeout=15)
+        except requests.RequestException as exc:
+            st.warning(f"Backend not reachable: {exc}")
+            return None
+        if resp.status_code == 200:
+            payload = orjson.loads(resp.content)
+            if payload.get("status") in _TERMINAL_STATUSES:
+                return payload
+        time.sleep(interval)
+    return None
+
+
+def collect_quotes(extraction: dict) -> set[str]:
+    # One pass over fields and line items straight into the dedup set —
+    # no intermediate list.
+    entries = chain(extraction.get("fields", {}).values(), extraction.get("line_items", []))
+    return {
+        ev["quote"]
+        for entry in entries
+        for ev in entry.get("evidence") or []
+        if ev and ev.get("quote")
+    }
+
+
+def highlight_quotes(raw_text: str, quotes: set[str]) -> str:
+    """Wrap every evidence quote in <mark> using one compiled alternation pass.
+
+    A single pattern.sub scans the text once (O(len(text))) instead of one
+    full replace() scan per quote; longest-first ordering keeps overlapping
+    quotes from producing nested marks.
+    """
+    escaped = html.escape(raw_text)
+    if not quotes:
+        return escaped
+    ordered = sorted(quotes, key=len, reverse=True)
+    pattern = re.compile("|".join(re.escape(html.escape(q)) for q in ordered))
+    return pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", escaped)
+
+
+def _field_block(name: str, field: dict) -> str:
     conf = field.get("confidence", 0)
     color = "red" if conf < CONFIDENCE_THRESHOLD else "green"
-    st.markdown(
-        f"**{name}**: {field.get('value')}  \n"
-        f":{color}[confidence: {conf}]"
-    )
+    block = f"**{name}**: {field.get('value')}  \n:{color}[confidence: {conf}]"
     evidences = field.get("evidence") or []
-    if evidences and evidences[0]:
-        ev = evidences[0]
-        if ev.get("quote"):
-            st.caption(f"quote: {ev['quote']}")
+    if evidences and evidences[0] and evidences[0].get("quote"):
+        block += f"  \n*quote: {evidences[0]['quote']}*"
+    return block
 
 
 def render_extraction(extraction: dict) -> None:
@@ -58,21 +133,29 @@ def render_extraction(extraction: dict) -> None:
         st.info("No extracted fields.")
         return
 
-    for name, field in fields.items():
-        render_field(name, field)
+    # Every st.* call is a websocket delta; one markdown block for all
+    # fields and one dataframe for all line items keep the deltas O(1)
+    # instead of O(fields + rows).
+    st.markdown("\n\n".join(_field_block(name, field) for name, field in fields.items()))
     st.divider()
 
     line_items = extraction.get("line_items", [])
     if line_items:
         st.subheader("Line Items")
-        for row in line_items:
-            conf = row.get("confidence", 0)
-            color = "red" if conf < CONFIDENCE_THRESHOLD else "green"
-            cols = st.columns([3, 2, 2, 2])
-            cols[0].write(row.get("service") or "-")
-            cols[1].write(row.get("code") or "-")
-            cols[2].write(f"${row.get('amount', 0):.2f}" if row.get("amount") is not None else "-")
-            cols[3].markdown(f":{color}[{conf}]")
+        # Column-oriented dict: four flat lists instead of a dict per row,
+        # and the walrus keeps amount to a single probe per row.
+        st.dataframe(
+            {
+                "service": [row.get("service") or "-" for row in line_items],
+                "code": [row.get("code") or "-" for row in line_items],
+                "amount": [
+                    f"${amount:.2f}" if (amount := row.get("amount")) is not None else "-"
+                    for row in line_items
+                ],
+                "confidence": [row.get("confidence", 0) for row in line_items],
+            },
+            use_container_width=True,
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -96,14 +179,27 @@ with upload_tab:
                     uploaded_file.type or "application/octet-stream",
                 )
             }
+            # The POST returns 202 with the document id right away; the
+            # pipeline runs server-side while we poll, so the socket and the
+            # script-run thread are never held for the full OCR+LLM duration.
             result = api_post("/api/upload", files=files)
             if result:
-                st.success("Upload complete.")
-                st.json(result)
-                detail = api_get(f"/api/documents/{result['document_id']}")
-                if detail and detail.get("extraction"):
-                    st.subheader("Extraction Detail")
-                    render_extraction(detail["extraction"])
+                doc_id = result["document_id"]
+                with st.status("Processing...", expanded=False):
+                    final = poll_document_status(doc_id)
+                _api_get_cached.clear()
+                if final is None:
+                    st.error("Processing timed out; check the Documents tab later.")
+                elif final.get("status") == "failed":
+                    st.error("Processing failed.")
+                    st.json(final)
+                else:
+                    st.success("Upload complete.")
+                    st.json(final)
+                    detail = api_get(f"/api/documents/{doc_id}")
+                    if detail and detail.get("extraction"):
+                        st.subheader("Extraction Detail")
+                        render_extraction(detail["extraction"])
 
 # ---- Review Queue tab -----------------------------------------------------
 
@@ -127,20 +223,30 @@ with review_tab:
             ):
                 st.caption(f"Document ID: {doc_id}")
 
-                detail = api_get(f"/api/documents/{doc_id}")
-                if detail and detail.get("extraction"):
-                    render_extraction(detail["extraction"])
+                # The queue payload already embeds the latest extraction; no
+                # per-document detail round trip needed.
+                extraction = item.get("extraction")
+                if extraction:
+                    render_extraction(extraction)
+
+                    if st.checkbox("Show source text", key=f"source_{doc_id}"):
+                        ocr = api_get(f"/api/documents/{doc_id}/ocr")
+                        if ocr and ocr.get("full_text"):
+                            marked = highlight_quotes(ocr["full_text"], collect_quotes(extraction))
+                            st.markdown(f"<pre>{marked}</pre>", unsafe_allow_html=True)
 
                     col_approve, col_reject = st.columns(2)
                     if col_approve.button("Approve", key=f"approve_{doc_id}", type="primary"):
                         resp = api_post(f"/api/review/{doc_id}/approve", data={"extraction_json": ""})
                         if resp:
                             st.success(f"Approved {doc_id[:8]}")
+                            _api_get_cached.clear()
                             st.rerun()
                     if col_reject.button("Reject", key=f"reject_{doc_id}"):
                         resp = api_post(f"/api/review/{doc_id}/reject")
                         if resp:
                             st.warning(f"Rejected {doc_id[:8]}")
+                            _api_get_cached.clear()
                             st.rerun()
 
 # ---- Documents tab --------------------------------------------------------
@@ -149,7 +255,8 @@ with documents_tab:
     if st.button("Refresh Documents"):
         pass
 
-    docs = api_get("/api/documents")
+    # One hydrated listing instead of a detail GET per expander.
+    docs = api_get("/api/documents?include=extraction")
     if docs is None:
         st.stop()
 
@@ -162,8 +269,7 @@ with documents_tab:
                 f"confidence: {doc.get('confidence_score', '?')}"
             ):
                 st.caption(f"ID: {doc['id']}")
-                detail = api_get(f"/api/documents/{doc['id']}")
-                if detail and detail.get("extraction"):
-                    render_extraction(detail["extraction"])
-                elif detail:
-                    st.code(json.dumps(detail, indent=2), language="json")
+                if doc.get("extraction"):
+                    render_extraction(doc["extraction"])
+                else:
+                    st.code(json.dumps(doc, indent=2, default=str), language="json")
@@ -5,17 +5,34 @@ import io
 import pytest
 from fastapi.testclient import TestClient
 
-from app.database import Base, engine
+from app.database import Base, SessionScoped, engine
 from app.main import app
 
 
-@pytest.fixture(autouse=True)
-def reset_db() -> None:
+@pytest.fixture(scope="session", autouse=True)
+def _create_schema() -> None:
+    # DDL once per run instead of a drop_all/create_all per test function.
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def reset_db():
+    # Per-test cleanup is plain DML in one transaction. A savepoint-join
+    # reset (everything inside one rolled-back outer transaction) doesn't
+    # work here: upload's background task commits from its own session, and
+    # rolling back the request session's dangling savepoint would discard
+    # those interleaved writes.
+    yield
+    SessionScoped.remove()
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+# Session scope: entering the context fires the ASGI lifespan (startup), so a
+# function-scoped client would re-run startup for every test.
+@pytest.fixture(scope="session")
 def client() -> TestClient:
     with TestClient(app) as test_client:
         yield test_client
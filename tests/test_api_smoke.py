@@ -16,15 +16,57 @@ def test_upload_status_and_document_smoke(client, fake_png_file, monkeypatch) ->
     monkeypatch.setattr("app.api.upload.process_document", fake_process)
 
     response = client.post("/api/upload", files={"file": fake_png_file})
-    assert response.status_code == 200
+    assert response.status_code == 202
     payload = response.json()
-    assert payload["status"] == "processed"
+    assert payload["status"] == "uploaded"
     document_id = payload["document_id"]
 
+    # TestClient runs background tasks before returning, so the pipeline
+    # has already completed by the time we poll.
     status = client.get(f"/api/upload/{document_id}/status")
     assert status.status_code == 200
+    assert status.json()["status"] == "processed"
     assert status.json()["document_type"] == "medical_bill"
 
     document = client.get(f"/api/documents/{document_id}")
     assert document.status_code == 200
     assert document.json()["id"] == document_id
+
+
+def test_document_endpoints_honor_if_none_match(client, fake_png_file, monkeypatch) -> None:
+    monkeypatch.setattr("app.api.upload.process_document", lambda db, document: document)
+    document_id = client.post("/api/upload", files={"file": fake_png_file}).json()["document_id"]
+
+    listing = client.get("/api/documents")
+    etag = listing.headers["ETag"]
+    assert client.get("/api/documents", headers={"If-None-Match": etag}).status_code == 304
+
+    detail = client.get(f"/api/documents/{document_id}")
+    etag = detail.headers["ETag"]
+    assert client.get(f"/api/documents/{document_id}", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_list_documents_query_count_is_constant(client, monkeypatch) -> None:
+    import io
+
+    from sqlalchemy import event
+
+    from app.database import engine
+
+    monkeypatch.setattr("app.api.upload.process_document", lambda db, document: document)
+    for idx in range(5):
+        client.post("/api/upload", files={"file": (f"doc{idx}.png", io.BytesIO(b"img"), "image/png")})
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/api/documents").status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) <= 2
@@ -34,12 +34,14 @@ def test_end_to_end_insurance_and_medical_documents(client, monkeypatch) -> None
     monkeypatch.setattr("app.processors.pipeline.run_ocr", fake_run_ocr)
 
     resp1 = client.post("/api/upload", files={"file": ("insurance.png", io.BytesIO(b"img"), "image/png")})
-    assert resp1.status_code == 200
-    assert resp1.json()["document_type"] == "insurance_claim"
+    assert resp1.status_code == 202
+    status1 = client.get(f"/api/upload/{resp1.json()['document_id']}/status")
+    assert status1.json()["document_type"] == "insurance_claim"
 
     resp2 = client.post("/api/upload", files={"file": ("medical.png", io.BytesIO(b"img"), "image/png")})
-    assert resp2.status_code == 200
-    assert resp2.json()["document_type"] == "medical_bill"
+    assert resp2.status_code == 202
+    status2 = client.get(f"/api/upload/{resp2.json()['document_id']}/status")
+    assert status2.json()["document_type"] == "medical_bill"
 
     all_docs = client.get("/api/documents")
     assert all_docs.status_code == 200
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from app.schemas import ExtractedField, ExtractionResult, LineItemExtraction
+from app.database import SessionLocal
+from app.models import Document, Extraction
+from app.processors.extractor import extract_structured_data_batch
+from app.queries import get_latest_extraction
+from app.schemas import ExtractedField, ExtractionResult, LineItemExtraction, OCRPage, OCRResult
 from app.processors.pipeline import _has_missing_critical, compute_document_confidence
 
 
@@ -37,3 +41,38 @@ def test_missing_critical_fields_triggers_review() -> None:
         raw_response={},
     )
     assert _has_missing_critical(result) is True
+
+
+def test_batch_extraction_keeps_input_order() -> None:
+    insurance = "Claim Number: CLM-1\nTotal Amount: $10.00"
+    medical = "Invoice Number: INV-2\nPatient Name: Bob\nTotal Amount: $20.00"
+    ocrs = [
+        OCRResult(full_text=text, pages=[OCRPage(page_number=1, text=text, words=[])])
+        for text in (insurance, medical)
+    ]
+
+    results = extract_structured_data_batch(ocrs)
+
+    assert [r.document_type for r in results] == ["insurance_claim", "medical_bill"]
+    assert results[0].fields["claim_number"].value == "CLM-1"
+    assert results[1].fields["invoice_number"].value == "INV-2"
+
+
+def test_latest_extraction_follows_insert_order() -> None:
+    # The latest-extraction lookup orders by id alone; this pins the
+    # invariant it relies on — versions are written in insert (id) order.
+    db = SessionLocal()
+    try:
+        document = Document(original_filename="a.png", content_type="image/png", file_path="/tmp/a.png")
+        db.add(document)
+        db.commit()
+        for version in (1, 2, 3):
+            db.add(Extraction(document_id=document.id, version=version, extraction_data={}))
+            db.commit()
+
+        latest = get_latest_extraction(db, document.id)
+
+        assert latest is not None
+        assert latest.version == 3
+    finally:
+        db.close()